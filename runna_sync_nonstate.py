@@ -66,14 +66,8 @@ class IcsEvent:
     dtstart_date: dt.date
 
 
-def unfold_ics_lines(text: str) -> List[str]:
-    out: List[str] = []
-    for ln in text.splitlines():
-        if out and ln.startswith((" ", "\t")):
-            out[-1] += ln[1:]
-        else:
-            out.append(ln)
-    return out
+FOLD_RE = re.compile(r"(?:\r\n|\r|\n)[ \t]")  # line break + continuation indent
+LINE_RE = re.compile(r"[^\r\n]+")
 
 
 def parse_ics_events(text: str) -> List[IcsEvent]:
@@ -81,7 +75,9 @@ def parse_ics_events(text: str) -> List[IcsEvent]:
     cur: Dict[str, str] = {}
     in_event = False
 
-    for line in unfold_ics_lines(text):
+    # Unfold in one pass, then walk lines without building a list of them
+    for m in LINE_RE.finditer(FOLD_RE.sub("", text)):
+        line = m.group()
         if line == "BEGIN:VEVENT":
             cur = {}
             in_event = True
@@ -99,21 +95,45 @@ def parse_ics_events(text: str) -> List[IcsEvent]:
                 )
             in_event = False
             continue
-        if in_event and ":" in line:
-            k, v = line.split(":", 1)
-            cur[k.split(";", 1)[0]] = v
+        if in_event:
+            colon = line.find(":")
+            if colon < 0:
+                continue
+            semi = line.find(";", 0, colon)
+            cur[line[:semi if semi >= 0 else colon]] = line[colon + 1:]
     return events
 
 
 # ============================================================
 # Translation helpers
 # ============================================================
-PACE_RE = re.compile(r"(\d+:\d{2})/km")
-KM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*km", re.I)
-RANGE_RE = re.compile(r"(\d+:\d{2})-(\d+:\d{2})/km")
+KM_PATTERN = r"(?P<km>\d+(?:\.\d+)?)\s*km"
+KM_RE = re.compile(KM_PATTERN, re.I)
 REPS_RE = re.compile(r"(\d+)\s*reps of", re.I)
 DASH_RE = re.compile(r"^-{3,}$")
 
+# Distance, pace range and single pace in one scan (distance shares KM_RE's pattern)
+METRIC_RE = re.compile(
+    r"(?P<range>(?P<range_lo>\d+:\d{2})-(?P<range_hi>\d+:\d{2})/km)"
+    r"|(?P<pace>\d+:\d{2})/km"
+    rf"|(?i:{KM_PATTERN})"
+)
+
+
+def scan_metrics(s: str) -> Tuple[Optional[str], Optional[Tuple[str, str]], Optional[str]]:
+    km = rng = pace = None
+    for m in METRIC_RE.finditer(s):
+        kind = m.lastgroup
+        if kind == "km":
+            km = km or m.group("km")
+        elif kind == "range":
+            rng = rng or (m.group("range_lo"), m.group("range_hi"))
+            # A range's upper bound also counts as the step's single pace
+            pace = pace or m.group("range_hi")
+        else:
+            pace = pace or m.group("pace")
+    return km, rng, pace
+
 
 def clean_line(s: str) -> str:
     return s.strip().lstrip("•").strip()
@@ -182,29 +202,25 @@ def translate_workout_to_intervals_text(
             i += 1
             first = True
             while i < len(steps) and not DASH_RE.match(steps[i]):
-                part = steps[i]
-                km = KM_RE.search(part)
-                rng = RANGE_RE.search(part)
-                pace = PACE_RE.search(part)
+                km, rng, pace = scan_metrics(steps[i])
 
                 if km and rng:
                     prefix = "run uphill " if hills and first else ""
-                    current.append(f"- {prefix}{km.group(1)}km {rng.group(1)}-{rng.group(2)}/km Pace")
+                    current.append(f"- {prefix}{km}km {rng[0]}-{rng[1]}/km Pace")
                 elif km and pace:
                     prefix = "run uphill " if hills and first else ""
-                    current.append(f"- {prefix}{km.group(1)}km {pace.group(1)}/km Pace")
+                    current.append(f"- {prefix}{km}km {pace}/km Pace")
                 first = False
                 i += 1
             flush()
             title = "Main Set"
             continue
 
-        km = KM_RE.search(ln)
-        pace = PACE_RE.search(ln)
+        km, _rng, pace = scan_metrics(ln)
         if km and pace:
-            current.append(f"- {km.group(1)}km {pace.group(1)}/km Pace")
+            current.append(f"- {km}km {pace}/km Pace")
         elif km and "conversational" in ln.lower():
-            current.append(f"- {km.group(1)}km {conversational_zone(name,'main')}")
+            current.append(f"- {km}km {conversational_zone(name,'main')}")
 
         i += 1
 
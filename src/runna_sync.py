@@ -2,17 +2,25 @@
 from __future__ import annotations
 
 import argparse
+import bisect
 import datetime as dt
+import functools
+import io
+import itertools
 import json
+import operator
 import os
 import re
 import sys
+import time
 import unittest
-from dataclasses import dataclass
-from enum import Enum, auto
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ============================================================
 # Cloudflare Workers guarded import
@@ -37,6 +45,34 @@ AUS_TZ = dt.timezone(dt.timedelta(hours=10))
 
 LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
 
+# Max events per bulk upload/delete request
+BATCH_SIZE = 100
+
+# Worker fetch(): boolean query params passed straight through to run_sync
+RUN_FLAGS = ("dry_run", "include_today", "all_workouts", "next_week", "delete_all", "clean_legacy")
+TRUTHY = frozenset(("1", "true", "yes", "y", "on"))
+# Worker fetch() response body: one reusable encoder, compact, UTF-8 as-is
+JSON_ENCODE = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+# Keep-alive sessions: one TLS handshake per host per process instead of one
+# per call. Retry keeps urllib3's defaults: connect errors are retried for
+# every method (POST included), read errors only for idempotent ones (GET,
+# PUT, ...), and HTTP error statuses are never retried.
+def make_session() -> requests.Session:
+    s = requests.Session()
+    s.mount(
+        "https://",
+        HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=3, backoff_factor=0.3)),
+    )
+    return s
+
+
+# Sessions are not thread-safe: the Intervals API calls (main thread) and the
+# ICS feed download (prefetch thread) each get their own.
+SESSION = make_session()
+FEED_SESSION = make_session()
+
 
 # ============================================================
 # Logging (structured JSON)
@@ -50,16 +86,27 @@ def is_debug(level: str) -> bool:
     return LOG_LEVELS[normalize_log_level(level)] <= LOG_LEVELS["DEBUG"]
 
 
-def now_utc() -> dt.datetime:
-    return dt.datetime.now(dt.timezone.utc)
-
-
 def aus_today() -> dt.date:
     return dt.datetime.now(AUS_TZ).date()
 
 
+# Per-second prefix of the log timestamp, reused until the second changes
+_ts_sec = -1
+_ts_prefix = ""
+
+
+def log_timestamp() -> str:
+    # UTC ISO-8601 with microseconds and "+00:00" (datetime.isoformat() shape),
+    # without building datetime objects
+    global _ts_sec, _ts_prefix
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    if sec != _ts_sec:
+        _ts_sec, _ts_prefix = sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+    return f"{_ts_prefix}.{ns // 1000:06d}+00:00"
+
+
 def log(level: str, msg: str, **fields: Any) -> None:
-    payload = {"ts": now_utc().isoformat(), "level": level, "msg": msg, **fields}
+    payload = {"ts": log_timestamp(), "level": level, "msg": msg, **fields}
 
     # Cloudflare/Wrangler marks stderr output as "[ERROR]" regardless of JSON.
     # Route INFO/DEBUG to stdout; WARN/ERROR to stderr.
@@ -79,15 +126,27 @@ def basic_auth(api_key_value: str) -> requests.auth.HTTPBasicAuth:
 # ============================================================
 # ICS parsing (minimal, robust for Runna feed)
 # ============================================================
-@dataclass
+@dataclass(slots=True)
 class IcsEvent:
     uid: str
     summary: str
     description: str
     dtstart_date: dt.date
+    # Derived once from dtstart_date: Intervals start_date_local, and the day
+    # ordinal the date filters compare as plain ints
+    start_local: str = field(init=False, repr=False, compare=False)
+    ordinal: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.start_local = f"{self.dtstart_date.isoformat()}T07:00:00"
+        self.ordinal = self.dtstart_date.toordinal()
 
 
 def unfold_ics_lines(text: str) -> List[str]:
+    # Fast path: no folded (continuation) lines to join
+    if "\n " not in text and "\n\t" not in text and "\r " not in text and "\r\t" not in text:
+        return text.splitlines()
+
     out: List[str] = []
     for ln in text.splitlines():
         if out and ln.startswith((" ", "\t")):
@@ -116,50 +175,97 @@ def parse_dtstart_date(raw_value: str) -> Optional[dt.date]:
     return None
 
 
+VEVENT_BEGIN_RE = re.compile(r"^BEGIN:VEVENT$", re.MULTILINE)
+VEVENT_END_RE = re.compile(r"^END:VEVENT$", re.MULTILINE)
+# Only the properties we use; parameters (";VALUE=DATE") are skipped
+VEVENT_FIELD_RE = re.compile(r"^(UID|SUMMARY|DESCRIPTION|DTSTART)[^\S\n]*(?:;[^:\n]*)?:(.*)$", re.MULTILINE)
+
+
 def parse_ics_events(text: str) -> List[IcsEvent]:
-    lines = unfold_ics_lines(text)
+    text = "\n".join(unfold_ics_lines(text))
     events: List[IcsEvent] = []
-    cur: Dict[str, str] = {}
-    in_event = False
 
-    for line in lines:
-        if line == "BEGIN:VEVENT":
-            cur = {}
-            in_event = True
-            continue
-
-        if line == "END:VEVENT":
-            if in_event:
-                uid = cur.get("UID", "").strip()
-                summary = ics_unescape(cur.get("SUMMARY", "")).strip()
-                desc = ics_unescape(cur.get("DESCRIPTION", "")).strip()
-                dtstart = parse_dtstart_date(cur.get("DTSTART", ""))
-                if uid and dtstart:
-                    events.append(
-                        IcsEvent(uid=uid, summary=summary, description=desc, dtstart_date=dtstart)
-                    )
-            in_event = False
+    # Each chunk after a BEGIN:VEVENT line holds one event up to its END:VEVENT;
+    # a chunk without one (unterminated event) is skipped.
+    for block in VEVENT_BEGIN_RE.split(text)[1:]:
+        end = VEVENT_END_RE.search(block)
+        if not end:
             continue
 
-        if not in_event or ":" not in line:
-            continue
+        cur: Dict[str, str] = {}
+        for m in VEVENT_FIELD_RE.finditer(block, 0, end.start()):
+            cur[m.group(1)] = m.group(2)
 
-        k, v = line.split(":", 1)
-        key = k.split(";", 1)[0].strip()
-        cur[key] = v
+        ev = event_from_fields(cur)
+        if ev:
+            events.append(ev)
 
     return events
 
 
+def event_from_fields(cur: Dict[str, str]) -> Optional[IcsEvent]:
+    uid = cur.get("UID", "").strip()
+    summary = ics_unescape(cur.get("SUMMARY", "")).strip()
+    desc = ics_unescape(cur.get("DESCRIPTION", "")).strip()
+    dtstart = parse_dtstart_date(cur.get("DTSTART", ""))
+    if uid and dtstart:
+        return IcsEvent(uid=uid, summary=summary, description=desc, dtstart_date=dtstart)
+    return None
+
+
+def parse_ics_events_stream(lines: Iterable[str]) -> Iterator[IcsEvent]:
+    # Same rules as parse_ics_events, but over an iterable of raw lines (e.g. a
+    # streamed HTTP body); only the current VEVENT is held in memory.
+    cur: Optional[Dict[str, str]] = None
+    pending = ""
+
+    def logical_line(ln: str) -> Optional[IcsEvent]:
+        nonlocal cur
+        if ln == "BEGIN:VEVENT":
+            cur = {}
+        elif cur is not None:
+            if ln == "END:VEVENT":
+                done, cur = cur, None
+                return event_from_fields(done)
+            m = VEVENT_FIELD_RE.match(ln)
+            if m:
+                cur[m.group(1)] = m.group(2)
+        return None
+
+    for ln in lines:
+        ln = ln.rstrip("\r\n")
+        if not ln:
+            continue
+        if ln[0] in " \t" and pending:
+            pending += ln[1:]
+            continue
+        ev = logical_line(pending)
+        if ev:
+            yield ev
+        pending = ln
+
+    ev = logical_line(pending)
+    if ev:
+        yield ev
+
+
 # ============================================================
 # Translator (STATE MACHINE)
 # ============================================================
-PACE_RE = re.compile(r"(\d+:\d{2})/km")
-RANGE_RE = re.compile(r"(\d+:\d{2})-(\d+:\d{2})/km")
-KM_RE = re.compile(r"(\d+(?:\.\d+)?)\s*km\b", re.IGNORECASE)
-M_DIST_RE = re.compile(r"(\d+)\s*m\b", re.IGNORECASE)  # meters -> km
-SEC_RE = re.compile(r"(\d+)\s*s\b", re.IGNORECASE)
-MIN_RE = re.compile(r"(\d+)\s*m\b", re.IGNORECASE)
+KM_PATTERN = r"(?P<km>\d+(?:\.\d+)?)\s*km\b"
+M_DIST_PATTERN = r"(?P<meters>\d+)\s*m\b"  # meters -> km
+KM_RE = re.compile(KM_PATTERN, re.IGNORECASE)
+M_DIST_RE = re.compile(M_DIST_PATTERN, re.IGNORECASE)
+
+# Range / pace / distance / seconds in one pass; m.lastgroup names the
+# alternative that matched. Distances share their patterns with KM_RE/M_DIST_RE.
+METRIC_RE = re.compile(
+    r"(?P<range>(?P<range_lo>\d+:\d{2})-(?P<range_hi>\d+:\d{2})/km)"
+    r"|(?P<pace>\d+:\d{2})/km"
+    rf"|(?i:{KM_PATTERN})"
+    rf"|(?i:{M_DIST_PATTERN})"
+    r"|(?i:(?P<secs>\d+)\s*s\b)"
+)
 
 REPS_RE = re.compile(r"^\s*(\d+)\s*reps of\s*:?\s*$", re.IGNORECASE)
 REPEAT_FOLLOWING_RE = re.compile(r"^\s*repeat the following\s+(\d+)x\s*:?\s*$", re.IGNORECASE)
@@ -167,6 +273,13 @@ SEP_LINE_RE = re.compile(r"^\s*-{3,}\s*$")  # ----------
 
 FAST_BURSTS_HINT = "add 3x 15s fast bursts"
 
+# Group titles and fixed outputs, shared by every translator instance
+MAIN_SET = "Main Set"
+WARMUP = "Warmup"
+COOLDOWN = "Cooldown"
+HILLS_FALLBACK_STEP = "- 2m Z1-Z2 Pace"
+FALLBACK_TRANSLATION = f"{MAIN_SET}\n- 60m Z1-Z2 Pace"
+
 # Only true boilerplate is noise
 NOISE_SUBSTRINGS = [
     "view in the runna app",
@@ -174,30 +287,56 @@ NOISE_SUBSTRINGS = [
 ]
 
 
+# Runna boilerplate removed from a line: the pace cap parenthetical (line kept)
+# and the limit/target/easy disclaimers (rest of line dropped). The "truly
+# easy" phrase only goes when nothing but caps/disclaimers follows it, in
+# either order relative to the limit/target disclaimer.
+CLEAN_RE = re.compile(
+    r"\(no faster than[^)]*\)"
+    r"|\bthis is a limit\b.*$"
+    r"|\bnot a target\b.*$"
+    r"|\brun at whatever pace feels truly easy!?"
+    r"(?:\s|\(no faster than[^)]*\))*(?:\b(?:this is a limit|not a target)\b.*)?$",
+    re.IGNORECASE,
+)
+
+
+def strip_trailing_punct(s: str) -> str:
+    s = s.rstrip()
+    while s.endswith("."):
+        s = s[:-1].rstrip()
+    return s.strip()
+
+
 def clean_line(s: str) -> str:
     s = (s or "").strip()
     if s.startswith("•"):
         s = s[1:].strip()
 
-    # remove pace cap parenthetical, keep the line
-    s = re.sub(r"\(no faster than[^)]*\)", "", s, flags=re.IGNORECASE).strip()
-
-    # strip Runna disclaimers BUT keep actionable content
-    s = re.sub(r"\bthis is a limit\b.*$", "", s, flags=re.IGNORECASE).strip()
-    s = re.sub(r"\bnot a target\b.*$", "", s, flags=re.IGNORECASE).strip()
-    s = re.sub(r"\brun at whatever pace feels truly easy!?$", "", s, flags=re.IGNORECASE).strip()
+    # Fast path: nothing CLEAN_RE could match. ASCII-only so that lower() is a
+    # safe stand-in for IGNORECASE.
+    if "(" not in s and s.isascii():
+        ll = s.lower()
+        if "limit" not in ll and "target" not in ll and "truly easy" not in ll:
+            return strip_trailing_punct(s)
 
-    # clean trailing punctuation
-    s = re.sub(r"[.\s]+$", "", s).strip()
-    return s
+    return strip_trailing_punct(CLEAN_RE.sub("", s))
 
 
 def split_on_commas(line: str) -> List[str]:
-    parts = [p.strip() for p in (line or "").split(",") if p.strip()]
+    line = line or ""
+    if "," not in line:
+        return [line.strip()]
+    parts = [p.strip() for p in line.split(",") if p and not p.isspace()]
     return parts if parts else [line.strip()]
 
 
 def meters_to_km_str(meters: int) -> str:
+    # Runna distances are almost always whole hundreds of metres: integer fast paths
+    if meters % 1000 == 0:
+        return f"{meters // 1000}km"
+    if meters % 100 == 0:
+        return f"{meters // 1000}.{meters // 100 % 10}km"
     km = meters / 1000.0
     s = f"{km:.3f}".rstrip("0").rstrip(".")
     return f"{s}km"
@@ -213,34 +352,13 @@ def parse_distance(line: str) -> Optional[str]:
     return None
 
 
-def parse_duration(line: str) -> Optional[str]:
-    m = SEC_RE.search(line)
-    if m:
-        return f"{int(m.group(1))}s"
-    m = MIN_RE.search(line)
-    if m:
-        return f"{int(m.group(1))}m"
-    return None
-
-
-def is_noise(line: str) -> bool:
-    ll = (line or "").lower()
-    return any(x in ll for x in NOISE_SUBSTRINGS)
+# "uphill", "downhill", "jog downhill" and "base of hill" all contain "hill"
+HILLS_KEYWORDS = ("hill", "jog back down")
 
 
 def is_hills_by_text(full_description: str) -> bool:
     t = (full_description or "").lower()
-    return any(
-        k in t
-        for k in (
-            "hill",
-            "uphill",
-            "downhill",
-            "jog back down",
-            "jog downhill",
-            "base of hill",
-        )
-    )
+    return any(k in t for k in HILLS_KEYWORDS)
 
 
 def conversational_zone(workout_name: str, context: str) -> str:
@@ -256,17 +374,17 @@ def single_line_easy_zone() -> str:
     return "Z2-Z3 Pace"
 
 
-class TState(Enum):
-    NORMAL = auto()
-    REPEAT_OPEN = auto()           # repeat without separators
-    REPEAT_SEP_WAIT_OPEN = auto()  # after repeat header waiting for first separator
-    REPEAT_SEP_CAPTURE = auto()    # capturing ONLY between separators
+# Translator states (plain ints: compared on every body line)
+STATE_NORMAL = 0
+STATE_REPEAT_OPEN = 1           # repeat without separators
+STATE_REPEAT_SEP_WAIT_OPEN = 2  # after repeat header waiting for first separator
+STATE_REPEAT_SEP_CAPTURE = 3    # capturing ONLY between separators
 
+STEP_COOLDOWN = 1  # step flag bit: step came from a "cool down" line
 
-@dataclass
-class Group:
-    title: str
-    steps: List[str]
+# A group is a plain (title, steps) tuple; steps are (step text, STEP_* flags).
+# The steps list is mutated in place, the title never changes.
+Group = Tuple[str, List[Tuple[str, int]]]
 
 
 class RunnaTranslatorStateMachine:
@@ -275,34 +393,38 @@ class RunnaTranslatorStateMachine:
         self.full_description = full_description or ""
         self.hills_mode = is_hills_by_text(full_description)
 
+        # Per-workout invariants, resolved once rather than per fragment
+        self.is_easy_run = self.workout_name.lower().startswith("easy run")
+        self.warmup_zone = conversational_zone(self.workout_name, "warmup")
+        self.main_zone = conversational_zone(self.workout_name, "main")
+
         self.groups: List[Group] = []
-        self.current = Group("Main Set", [])
+        self.current: Group = (MAIN_SET, [])
         self.partial = False
 
-        self.state = TState.NORMAL
+        self.state = STATE_NORMAL
         self.repeat_group: Optional[Group] = None
         self.repeat_first_step_pending = False
 
         # hills-only fallback injection guard
         self.hills_fallback_added = False
-        self.cooldown_steps: set[int] = set()
 
     def _flush_current(self) -> None:
-        if self.current.steps:
+        if self.current[1]:
             self.groups.append(self.current)
-        self.current = Group("Main Set", [])
+        self.current = (MAIN_SET, [])
 
     def _start_group(self, title: str) -> None:
         self._flush_current()
-        self.current = Group(title, [])
+        self.current = (title, [])
 
     def _start_repeat_group(self, reps: int) -> None:
         self._flush_current()
-        self.repeat_group = Group(f"Main Set {reps}x", [])
+        self.repeat_group = (f"{MAIN_SET} {reps}x", [])
         self.repeat_first_step_pending = True
 
     def _close_repeat_group(self) -> None:
-        if self.repeat_group and self.repeat_group.steps:
+        if self.repeat_group and self.repeat_group[1]:
             self.groups.append(self.repeat_group)
         self.repeat_group = None
         self.repeat_first_step_pending = False
@@ -310,10 +432,10 @@ class RunnaTranslatorStateMachine:
     def _add_hills_fallback_if_needed(self) -> None:
         # Only include "2m Z1-Z2 Pace" fallback in context of a hill
         if self.hills_mode and not self.hills_fallback_added:
-            self.current.steps.append("- 2m Z1-Z2 Pace")
+            self.current[1].append((HILLS_FALLBACK_STEP, 0))
             self.hills_fallback_added = True
 
-    def _add_step(self, step: str, into_repeat: bool) -> None:
+    def _add_step(self, step: str, into_repeat: bool, flags: int = 0) -> None:
         if into_repeat and self.repeat_group is not None:
             if self.hills_mode and self.repeat_first_step_pending:
                 if step.startswith("- "):
@@ -321,101 +443,119 @@ class RunnaTranslatorStateMachine:
                 else:
                     step = "run uphill " + step
                 self.repeat_first_step_pending = False
-            self.repeat_group.steps.append(step)
+            self.repeat_group[1].append((step, flags))
         else:
-            self.current.steps.append(step)
+            self.current[1].append((step, flags))
 
-    def _process_fragment(self, frag: str, allow_group_change: bool, into_repeat: bool) -> None:
+    def _process_fragment(
+        self, frag: str, allow_group_change: bool, into_repeat: bool, ll: Optional[str] = None
+    ) -> None:
+        # ll: lowercased frag when the caller already has it (whole-line fragments)
         line = clean_line(frag)
-        if not line or is_noise(line) or SEP_LINE_RE.match(line):
+        if not line:
+            return
+        if ll is None or line != frag:
+            ll = line.lower()
+        if any(x in ll for x in NOISE_SUBSTRINGS) or (line[0] == "-" and SEP_LINE_RE.match(line)):
             return
-
-        ll = line.lower()
 
         # Ignore fast bursts instruction entirely
         if FAST_BURSTS_HINT in ll:
             return
 
+        # Single scan for distance / duration / pace; first match of each kind wins
+        km = meters = secs = pace = rng_lo = rng_hi = None
+        for m in METRIC_RE.finditer(line):
+            kind = m.lastgroup
+            if kind == "range":
+                if rng_lo is None:
+                    rng_lo, rng_hi = m.group("range_lo"), m.group("range_hi")
+            elif kind == "pace":
+                if pace is None:
+                    pace = m.group("pace")
+            elif kind == "km":
+                if km is None:
+                    km = m.group("km")
+            elif kind == "meters":
+                if meters is None:
+                    meters = m.group("meters")
+            elif secs is None:
+                secs = m.group("secs")
+
+        if km is not None:
+            dist: Optional[str] = f"{km}km"
+        elif meters is not None:
+            dist = meters_to_km_str(int(meters))
+        else:
+            dist = None
+
+        if secs is not None:
+            dur: Optional[str] = f"{int(secs)}s"
+        elif meters is not None:
+            dur = f"{int(meters)}m"
+        else:
+            dur = None
+
         # Warmup / cooldown group changes only allowed outside repeat capture
         if allow_group_change and "warm up" in ll:
-            self._start_group("Warmup")
-            dist = parse_distance(line) or "2m"
-            self._add_step(f"- {dist} ramp {conversational_zone(self.workout_name, 'warmup')}", into_repeat=False)
+            self._start_group(WARMUP)
+            self._add_step(f"- {dist or '2m'} ramp {self.warmup_zone}", into_repeat=False)
             return
 
         if allow_group_change and "cool down" in ll:
-            self._start_group("Cooldown")
-            dist = parse_distance(line) or "2m"
-            step = f"- {dist} ramp Z3-Z1 Pace"
-            self._add_step(step, into_repeat=False)
-            self.cooldown_steps.add(id(step))
+            self._start_group(COOLDOWN)
+            self._add_step(f"- {dist or '2m'} ramp Z3-Z1 Pace", into_repeat=False, flags=STEP_COOLDOWN)
             return
 
         # Walking rest -> Z1 Pace (Walk replaced by Pace)
         if "walking rest" in ll:
-            dur = parse_duration(line) or "90s"
-            self._add_step(f"- {dur} Z1 Pace", into_repeat=into_repeat)
+            self._add_step(f"- {dur or '90s'} Z1 Pace", into_repeat=into_repeat)
             return
 
         # Hills rules (HR only for hills)
         if self.hills_mode:
-            if "running hard uphill" in ll or ("hard" in ll and "uphill" in ll):
-                dur = parse_duration(line) or "2m"
-                self._add_step(f"- {dur} Z3-Z5 HR", into_repeat=into_repeat)
+            # also covers "running hard uphill"
+            if "hard" in ll and "uphill" in ll:
+                self._add_step(f"- {dur or '2m'} Z3-Z5 HR", into_repeat=into_repeat)
                 return
 
-            if (
-                "easy jog back down" in ll
-                or "jog back down" in ll
-                or "easy jog back" in ll
-                or "jog downhill" in ll
-                or "downhill" in ll
-            ):
+            # also covers "easy jog back down" and "jog downhill"
+            if "jog back down" in ll or "easy jog back" in ll or "downhill" in ll:
                 jog_dur = "120s"
-                prev_steps = self.repeat_group.steps if (into_repeat and self.repeat_group) else self.current.steps
+                prev_steps = self.repeat_group[1] if (into_repeat and self.repeat_group) else self.current[1]
                 if prev_steps:
-                    prev = prev_steps[-1]
-                    ms = re.search(r"\b(\d+)s\b", prev)
-                    mm = re.search(r"\b(\d+)m\b", prev)
-                    if ms:
-                        jog_dur = f"{int(ms.group(1)) * 2}s"
-                    elif mm:
-                        jog_dur = f"{int(mm.group(1)) * 2}m"
+                    # Steps are built here from space-separated tokens, so the
+                    # previous duration is a whole "<n>s" (preferred) or "<n>m" token
+                    tokens = prev_steps[-1][0].split()
+                    for unit in ("s", "m"):
+                        n = next((t[:-1] for t in tokens if t[-1:] == unit and t[:-1].isdecimal()), None)
+                        if n is not None:
+                            jog_dur = f"{int(n) * 2}{unit}"
+                            break
                 self._add_step(f"- Press lap, Jog Downhill {jog_dur} Z1-Z2 Pace", into_repeat=into_repeat)
                 return
 
         # "easy jog" / "easy run" phrases => Z1-Z2 Pace
-        if ("easy jog" in ll or "easy run" in ll) and (parse_distance(line) or parse_duration(line)):
-            dist = parse_distance(line)
-            dur = parse_duration(line)
-            if dist:
-                self._add_step(f"- {dist} Z1-Z2 Pace", into_repeat=into_repeat)
-            else:
-                self._add_step(f"- {dur} Z1-Z2 Pace", into_repeat=into_repeat)  # type: ignore[arg-type]
+        if ("easy jog" in ll or "easy run" in ll) and (dist or dur):
+            self._add_step(f"- {dist or dur} Z1-Z2 Pace", into_repeat=into_repeat)
             return
 
         # Distance + pace parsing
-        dist = parse_distance(line)
-        rng = RANGE_RE.search(line)
-        pace = PACE_RE.search(line)
-
-        if dist and rng:
-            target = rng.group(1)
-            lo, hi = rng.group(1), rng.group(2)
-            self._add_step(f"- {dist} {target}/km PACE ({lo}-{hi}/km) Pace", into_repeat=into_repeat)
+        if dist and rng_lo:
+            self._add_step(f"- {dist} {rng_lo}/km PACE ({rng_lo}-{rng_hi}/km) Pace", into_repeat=into_repeat)
             return
 
         if dist and pace:
-            self._add_step(f"- {dist} {pace.group(1)}/km Pace", into_repeat=into_repeat)
+            self._add_step(f"- {dist} {pace}/km Pace", into_repeat=into_repeat)
             return
 
         # Conversational pace handling
         if dist and "conversational" in ll:
-            self._add_step(f"- {dist} {conversational_zone(self.workout_name, 'main')}", into_repeat=into_repeat)
+            self._add_step(f"- {dist} {self.main_zone}", into_repeat=into_repeat)
             return
 
         # Single-line easy run style
-        if dist and ("easy run" in ll or (self.workout_name.lower().startswith("easy run") and "easy" in ll)):
+        if dist and ("easy run" in ll or (self.is_easy_run and "easy" in ll)):
             self._add_step(f"- {dist} {single_line_easy_zone()}", into_repeat=into_repeat)
             return
 
@@ -425,11 +565,9 @@ class RunnaTranslatorStateMachine:
             return
 
         # Duration-only
-        dur = parse_duration(line)
         if dur:
             self._add_step(f"- {dur} Z1-Z2 Pace", into_repeat=into_repeat)
             return
-        
 
         # Unknown fragment
         self.partial = True
@@ -438,7 +576,7 @@ class RunnaTranslatorStateMachine:
     def translate(self) -> Tuple[str, bool]:
         raw_lines = [(l or "") for l in (self.full_description or "").splitlines()]
         if not raw_lines:
-            return ("Main Set\n- 60m Z1-Z2 Pace", True)
+            return (FALLBACK_TRANSLATION, True)
 
         # First line is not converted into steps (title line)
         first_line = raw_lines[0]
@@ -449,86 +587,97 @@ class RunnaTranslatorStateMachine:
             dist = parse_distance(first_line)
             ll = first_line.lower()
             if dist and ("easy" in ll or "conversational" in ll):
-                return (f"Main Set\n- {dist} {single_line_easy_zone()}", False)
-            if self.workout_name.lower().startswith("easy run") and dist:
-                return (f"Main Set\n- {dist} {single_line_easy_zone()}", False)
-            return ("Main Set\n- 60m Z1-Z2 Pace", True)
+                return (f"{MAIN_SET}\n- {dist} {single_line_easy_zone()}", False)
+            if self.is_easy_run and dist:
+                return (f"{MAIN_SET}\n- {dist} {single_line_easy_zone()}", False)
+            return (FALLBACK_TRANSLATION, True)
 
         for ln in body_lines:
             raw = ln
             ln = clean_line(ln)
 
             # NEW RULE: blank line ends repeat block
-            if raw.strip() == "" and self.state in (
-                TState.REPEAT_OPEN,
-                TState.REPEAT_SEP_CAPTURE,
-                TState.REPEAT_SEP_WAIT_OPEN,
-            ):
+            if raw.strip() == "" and self.state != STATE_NORMAL:
                 self._close_repeat_group()
-                self.state = TState.NORMAL
+                self.state = STATE_NORMAL
                 continue
 
             # ------------------------------------------------------------
             # BLANK LINE TERMINATES REPEAT BLOCK
             # ------------------------------------------------------------
-            if not ln and self.state in (TState.REPEAT_OPEN, TState.REPEAT_SEP_CAPTURE):
+            if not ln and self.state in (STATE_REPEAT_OPEN, STATE_REPEAT_SEP_CAPTURE):
                 self._close_repeat_group()
-                self.state = TState.NORMAL
+                self.state = STATE_NORMAL
                 continue
 
-            if not ln or is_noise(ln):
+            if not ln:
+                continue
+            ll = ln.lower()
+            if any(x in ll for x in NOISE_SUBSTRINGS):
                 continue
             # separators govern repeat capture
-            if SEP_LINE_RE.match(ln):
-                if self.state == TState.REPEAT_SEP_WAIT_OPEN:
-                    self.state = TState.REPEAT_SEP_CAPTURE
-                elif self.state == TState.REPEAT_SEP_CAPTURE:
+            # (ln is stripped, so a first-character test rules out most lines
+            # before any of the line regexes run)
+            if ln[0] == "-" and SEP_LINE_RE.match(ln):
+                if self.state == STATE_REPEAT_SEP_WAIT_OPEN:
+                    self.state = STATE_REPEAT_SEP_CAPTURE
+                elif self.state == STATE_REPEAT_SEP_CAPTURE:
                     self._close_repeat_group()
-                    self.state = TState.NORMAL
+                    self.state = STATE_NORMAL
                 continue
 
             # repeat header detection (NORMAL only)
-            if self.state == TState.NORMAL:
-                m1 = REPS_RE.match(ln)
-                m2 = REPEAT_FOLLOWING_RE.match(ln)
-                if m1 or m2:
-                    reps = int((m1 or m2).group(1))  # type: ignore
+            if self.state == STATE_NORMAL:
+                m = None
+                if ln[0].isdigit():
+                    m = REPS_RE.match(ln)
+                elif ll.startswith("repeat"):
+                    m = REPEAT_FOLLOWING_RE.match(ln)
+                if m:
+                    reps = int(m.group(1))
                     self._start_repeat_group(reps)
-                    self.state = TState.REPEAT_SEP_WAIT_OPEN
+                    self.state = STATE_REPEAT_SEP_WAIT_OPEN
                     continue
 
             # if waiting for separator but got content => repeat without separators
-            if self.state == TState.REPEAT_SEP_WAIT_OPEN:
-                self.state = TState.REPEAT_OPEN
+            if self.state == STATE_REPEAT_SEP_WAIT_OPEN:
+                self.state = STATE_REPEAT_OPEN
+
+            # A line without commas is its own single fragment; hand over ll with it
+            frags = split_on_commas(ln)
+            frag_ll = None if "," in ln else ll
 
-            if self.state in (TState.REPEAT_OPEN, TState.REPEAT_SEP_CAPTURE):
-                for frag in split_on_commas(ln):
-                    self._process_fragment(frag, allow_group_change=False, into_repeat=True)
+            if self.state in (STATE_REPEAT_OPEN, STATE_REPEAT_SEP_CAPTURE):
+                for frag in frags:
+                    self._process_fragment(frag, allow_group_change=False, into_repeat=True, ll=frag_ll)
                 continue
 
             # NORMAL
-            for frag in split_on_commas(ln):
-                self._process_fragment(frag, allow_group_change=True, into_repeat=False)
+            for frag in frags:
+                self._process_fragment(frag, allow_group_change=True, into_repeat=False, ll=frag_ll)
 
         # Close any open repeat at EOF
-        if self.state in (TState.REPEAT_OPEN, TState.REPEAT_SEP_CAPTURE, TState.REPEAT_SEP_WAIT_OPEN):
+        if self.state != STATE_NORMAL:
             self._close_repeat_group()
 
         self._flush_current()
         self._postprocess_trailing_cooldown()
 
-        # Format: blank line between groups, no blank line between title and steps
-        out: List[str] = []
-        for gi, g in enumerate(self.groups):
-            if gi > 0:
-                out.append("")
-            out.append(g.title)
-            out.extend(g.steps)
-
-        if not out:
-            return ("Main Set\n- 60m Z1-Z2 Pace", True)
-
-        return ("\n".join(out).rstrip(), self.partial)
+        if not self.groups:
+            return (FALLBACK_TRANSLATION, True)
+
+        # Format: blank line between groups, no blank line between title and steps.
+        # Written straight into one buffer; nothing trails the last step to strip.
+        buf = io.StringIO()
+        for gi, (title, steps) in enumerate(self.groups):
+            if gi:
+                buf.write("\n\n")
+            buf.write(title)
+            for text, _flags in steps:
+                buf.write("\n")
+                buf.write(text)
+
+        return (buf.getvalue(), self.partial)
     
     def _postprocess_trailing_conversational_to_cooldown(self) -> None:
         """
@@ -538,54 +687,56 @@ class RunnaTranslatorStateMachine:
         if not self.groups:
             return
 
-        last_group = self.groups[-1]
+        title, steps = self.groups[-1]
 
         # Only move from Main Set
-        if last_group.title != "Main Set":
+        if title != MAIN_SET:
             return
 
-        if not last_group.steps:
+        if not steps:
             return
 
-        last_step = last_group.steps[-1].lower()
+        last_step = steps[-1][0].lower()
 
         if "conversational" not in last_step:
             return
 
         # Remove from Main Set
-        step = last_group.steps.pop()
+        step = steps.pop()
 
         # Drop empty Main Set if needed
-        if not last_group.steps:
+        if not steps:
             self.groups.pop()
 
         # Append new Cooldown group
-        self.groups.append(Group("Cooldown", [step]))
+        self.groups.append((COOLDOWN, [step]))
 
 
     def _postprocess_trailing_cooldown(self) -> None:
         if not self.groups:
             return
 
-        last_group = self.groups[-1]
-        if last_group.title != "Main Set":
+        title, steps = self.groups[-1]
+        if title != MAIN_SET:
             return
 
-        if not last_group.steps:
+        if not steps:
             return
 
-        step = last_group.steps[-1]
+        step = steps[-1]
 
-        if id(step) not in self.cooldown_steps:
+        if not step[1] & STEP_COOLDOWN:
             return
 
         # Move to Cooldown group
-        last_group.steps.pop()
-        if not last_group.steps:
+        steps.pop()
+        if not steps:
             self.groups.pop()
 
-        self.groups.append(Group("Cooldown", [step]))
+        self.groups.append((COOLDOWN, [step]))
 
+# Pure function of its inputs; plans repeat the same workouts week to week
+@functools.lru_cache(maxsize=512)
 def translate_workout_to_intervals_text(workout_name: str, description: str) -> Tuple[str, bool]:
     sm = RunnaTranslatorStateMachine(workout_name, description)
     return sm.translate()
@@ -602,33 +753,42 @@ def intervals_http(
     json_body: Any = None,
     timeout: int = 60,
 ) -> requests.Response:
-    lvl = normalize_log_level(log_level)
-    log("DEBUG" if is_debug(lvl) else "INFO", "intervals_http", method=method, url=url)
-    r = requests.request(
+    # Request/response lines: DEBUG in debug runs, INFO otherwise
+    msg_level = "DEBUG" if is_debug(log_level) else "INFO"
+    log(msg_level, "intervals_http", method=method, url=url)
+    r = SESSION.request(
         method=method,
         url=url,
         auth=basic_auth(api_key),
         json=json_body,
         timeout=timeout,
     )
-    log("DEBUG" if is_debug(lvl) else "INFO", "intervals_http_response", status=r.status_code, url=url)
+    log(msg_level, "intervals_http_response", status=r.status_code, url=url)
     r.raise_for_status()
     return r
 
 
-def auth_test(api_key: str, athlete_id: str, log_level: str) -> None:
+# The auth check GETs the folder listing; it is returned so ensure_folder can reuse it
+def auth_test(api_key: str, athlete_id: str, log_level: str) -> List[Dict[str, Any]]:
     url = f"{BASE_URL}/api/v1/athlete/{athlete_id}/folders"
     log("INFO", "auth_test_start", url=url)
     r = intervals_http(log_level, "GET", url, api_key)
     log("INFO", "auth_test_ok", status=r.status_code)
+    return r.json()
 
 
-def ensure_folder(api_key: str, athlete_id: str, folder_name: str, log_level: str) -> int:
+def ensure_folder(
+    api_key: str,
+    athlete_id: str,
+    folder_name: str,
+    log_level: str,
+    folders: Optional[List[Dict[str, Any]]] = None,
+) -> int:
     url = f"{BASE_URL}/api/v1/athlete/{athlete_id}/folders"
-    r = intervals_http(log_level, "GET", url, api_key)
-    data = r.json()
+    if folders is None:
+        folders = intervals_http(log_level, "GET", url, api_key).json()
 
-    for obj in data:
+    for obj in folders:
         if obj.get("type") == "FOLDER" and obj.get("name") == folder_name:
             log("INFO", "folder_found", name=folder_name, folder_id=obj.get("id"))
             return int(obj["id"])
@@ -640,6 +800,34 @@ def ensure_folder(api_key: str, athlete_id: str, folder_name: str, log_level: st
     return fid
 
 
+def bulk_request(lvl: str, method: str, url: str, api_key: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # Send items in BATCH_SIZE chunks (bounded request bodies) and merge the
+    # results: highest status wins (errors already raised in intervals_http);
+    # list bodies are concatenated, others listed per batch. A single batch
+    # reports exactly as one request would.
+    batches = [items[i : i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)] or [items]
+    statuses: List[int] = []
+    bodies: List[Any] = []
+    for batch in batches:
+        r = intervals_http(lvl, method, url, api_key, json_body=batch, timeout=120)
+        statuses.append(r.status_code)
+        try:
+            bodies.append(r.json())
+        except Exception:
+            bodies.append(None)
+
+    out: Dict[str, Any] = {"dry_run": False, "count": len(items), "status": max(statuses)}
+    if len(batches) == 1:
+        out["json"] = bodies[0]
+    else:
+        out["batches"] = len(batches)
+        if all(isinstance(b, list) for b in bodies):
+            out["json"] = [x for b in bodies for x in b]
+        else:
+            out["json"] = bodies
+    return out
+
+
 def bulk_upload_events(api_key: str, events: List[Dict[str, Any]], log_level: str, dry_run: bool) -> Dict[str, Any]:
     lvl = normalize_log_level(log_level)
 
@@ -652,14 +840,7 @@ def bulk_upload_events(api_key: str, events: List[Dict[str, Any]], log_level: st
     if is_debug(lvl):
         log("DEBUG", "upload_payload", payload=events)
 
-    r = intervals_http(lvl, "POST", url, api_key, json_body=events, timeout=120)
-
-    out: Dict[str, Any] = {"dry_run": False, "count": len(events), "status": r.status_code}
-    try:
-        out["json"] = r.json()
-    except Exception:
-        out["json"] = None
-    return out
+    return bulk_request(lvl, "POST", url, api_key, events)
 
 
 def bulk_delete_events(
@@ -680,21 +861,19 @@ def bulk_delete_events(
     if is_debug(lvl):
         log("DEBUG", "delete_payload", payload=refs)
 
-    r = intervals_http(lvl, "PUT", url, api_key, json_body=refs, timeout=120)
-
-    out: Dict[str, Any] = {"dry_run": False, "count": len(refs), "status": r.status_code}
-    try:
-        out["json"] = r.json()
-    except Exception:
-        out["json"] = None
-    return out
+    return bulk_request(lvl, "PUT", url, api_key, refs)
 
 
 # ============================================================
 # Selection logic
 # ============================================================
-def start_date_local(ev: IcsEvent) -> str:
-    return f"{ev.dtstart_date.isoformat()}T07:00:00"
+event_ordinal = operator.attrgetter("ordinal")
+
+
+def sort_events(events: List[IcsEvent]) -> List[IcsEvent]:
+    """Sorts in place by date (stable) and returns the list; selection relies on it."""
+    events.sort(key=event_ordinal)
+    return events
 
 
 def select_events(
@@ -702,27 +881,31 @@ def select_events(
     include_today: bool,
     all_workouts: bool,
     next_week: bool,
-    log_level: str,
+    today: dt.date,
 ) -> List[IcsEvent]:
-    today = aus_today()
-
-    if all_workouts:
-        selected = events[:]
+    """
+    Return the events inside the run's date window. events must already be
+    sorted by date (sort_events): the window is found by binary search, so
+    unsorted input gives wrong results.
+    """
+    # Day-ordinal window [lo, hi) covering both filters; hi None = unbounded
+    today_ord = today.toordinal()
+    start = today_ord if include_today else today_ord + 1
+    if next_week:
+        lo, hi = start, start + 7
+    elif all_workouts:
+        lo, hi = 0, None
     else:
-        if include_today:
-            selected = [e for e in events if e.dtstart_date >= today]
-        else:
-            selected = [e for e in events if e.dtstart_date > today]
+        lo, hi = start, None
 
-    if next_week:
-        start = today if include_today else (today + dt.timedelta(days=1))
-        end = start + dt.timedelta(days=7)
-        selected = [e for e in selected if start <= e.dtstart_date < end]
+    # Sorted input: the window is one contiguous slice
+    i = bisect.bisect_left(events, lo, key=event_ordinal)
+    j = len(events) if hi is None else bisect.bisect_left(events, hi, key=event_ordinal)
+    # Whole feed (e.g. --all-workouts): nothing downstream mutates it, so no copy
+    selected = events if not i and j == len(events) else events[i:j]
 
     if selected:
-        dmin = min(e.dtstart_date for e in selected)
-        dmax = max(e.dtstart_date for e in selected)
-        log("INFO", "ics_selected_dates", start=str(dmin), end=str(dmax))
+        log("INFO", "ics_selected_dates", start=str(selected[0].dtstart_date), end=str(selected[-1].dtstart_date))
     else:
         log("INFO", "ics_selected_dates", start=None, end=None)
 
@@ -737,25 +920,33 @@ def select_events(
     return selected
 
 
-def hard_guard_drop_past(selected: List[IcsEvent], include_today: bool, log_level: str) -> List[IcsEvent]:
-    lvl = normalize_log_level(log_level)
-    today = aus_today()
-
+def hard_guard_drop_past(
+    selected: List[IcsEvent], include_today: bool, debug: bool, today: dt.date
+) -> List[IcsEvent]:
+    """
+    Drop events dated before today (or on today, unless include_today).
+    selected must be sorted by date, as select_events returns it: the past
+    events are found as a prefix by binary search.
+    """
     if include_today:
-        kept = [e for e in selected if e.dtstart_date >= today]
-        dropped = [e for e in selected if e.dtstart_date < today]
+        cut = bisect.bisect_left(selected, today.toordinal(), key=event_ordinal)
     else:
-        kept = [e for e in selected if e.dtstart_date > today]
-        dropped = [e for e in selected if e.dtstart_date <= today]
-
-    if dropped:
-        log("WARN", "dropped_past_events", dropped=len(dropped), kept=len(kept), today=str(today))
-        if is_debug(lvl):
-            log(
-                "DEBUG",
-                "dropped_past_event_examples",
-                examples=[{"date": e.dtstart_date.isoformat(), "uid": e.uid, "summary": e.summary} for e in dropped[:10]],
-            )
+        cut = bisect.bisect_right(selected, today.toordinal(), key=event_ordinal)
+    if not cut:
+        return selected
+
+    # Only the count and the first few examples of the dropped prefix are needed
+    kept = selected[cut:]
+    log("WARN", "dropped_past_events", dropped=cut, kept=len(kept), today=str(today))
+    if debug:
+        log(
+            "DEBUG",
+            "dropped_past_event_examples",
+            examples=[
+                {"date": e.dtstart_date.isoformat(), "uid": e.uid, "summary": e.summary}
+                for e in itertools.islice(selected, min(cut, 10))
+            ],
+        )
 
     return kept
 
@@ -763,39 +954,44 @@ def hard_guard_drop_past(selected: List[IcsEvent], include_today: bool, log_leve
 # ============================================================
 # Build Intervals payload
 # ============================================================
-def build_intervals_event(ev: IcsEvent, folder_id: int, log_level: str) -> Tuple[Dict[str, Any], bool]:
+def payload_base(folder_id: int) -> Dict[str, Any]:
+    # Keys shared by every event in a run; tags is a tuple so the copies can share it
+    return {"category": "WORKOUT", "type": "Run", "folder_id": folder_id, "tags": (RUNNA_TAG,)}
+
+
+def build_intervals_event(ev: IcsEvent, base: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
     name = (ev.summary or "").strip() or "Runna Workout"
     original_text = (ev.description or "").strip()
 
     translated, partial = translate_workout_to_intervals_text(name, original_text)
 
     # Divider between original and translated must be "-" (NOT "---")
-    combined_desc = original_text.rstrip() + "\n\n-\n\n" + translated.rstrip()
-
-    payload: Dict[str, Any] = {
-        "start_date_local": start_date_local(ev),
-        "name": name,
-        "category": "WORKOUT",
-        "type": "Run",
-        "folder_id": folder_id,
-        "external_id": ev.uid,
-        "tags": [RUNNA_TAG],
-        "description": combined_desc,
-    }
+    # (original_text is already stripped)
+    combined_desc = f"{original_text}\n\n-\n\n{translated.rstrip()}"
+
+    payload = base.copy()
+    payload["start_date_local"] = ev.start_local
+    payload["name"] = name
+    payload["external_id"] = ev.uid
+    payload["description"] = combined_desc
     return payload, partial
 
 
-def make_validation_report(results: List[Tuple[IcsEvent, bool, Dict[str, Any]]], log_level: str) -> Dict[str, Any]:
-    lvl = normalize_log_level(log_level)
-    total = len(results)
-    partials = [r for r in results if r[1]]
-    ok = total - len(partials)
+def make_validation_report(
+    evs: List[IcsEvent], partials: List[bool], payloads: List[Dict[str, Any]], debug: bool
+) -> Dict[str, Any]:
+    # evs / partials / payloads are parallel lists (one entry per event)
+    total = len(evs)
+    partial = sum(partials)
 
-    rep: Dict[str, Any] = {"total": total, "ok": ok, "partial": len(partials)}
-    if is_debug(lvl):
+    rep: Dict[str, Any] = {"total": total, "ok": total - partial, "partial": partial}
+    if debug:
+        # Stops scanning at the tenth partial
         rep["partial_examples"] = [
-            {"start_date_local": start_date_local(ev), "uid": ev.uid, "name": payload.get("name")}
-            for (ev, _is_partial, payload) in partials[:10]
+            {"start_date_local": ev.start_local, "uid": ev.uid, "name": payload.get("name")}
+            for (ev, _is_partial, payload) in itertools.islice(
+                (r for r in zip(evs, partials, payloads) if r[1]), 10
+            )
         ]
     return rep
 
@@ -803,6 +999,42 @@ def make_validation_report(results: List[Tuple[IcsEvent, bool, Dict[str, Any]]],
 # ============================================================
 # Sync runner
 # ============================================================
+T = TypeVar("T")
+
+# Pyodide (the Workers runtime) cannot start threads
+CAN_THREAD = sys.platform != "emscripten"
+
+
+def prefetch(fn: Callable[..., T], *args: Any) -> Callable[[], T]:
+    """
+    Start fn(*args) on a background thread and return a getter for its result
+    (re-raising its exception). Without threads, fn runs immediately instead.
+    """
+    if not CAN_THREAD:
+        result = fn(*args)
+        return lambda: result
+
+    pool = ThreadPoolExecutor(max_workers=1)
+    future = pool.submit(fn, *args)
+    pool.shutdown(wait=False)
+    return future.result
+
+
+def fetch_ics_events(runna_ics_url: str) -> List[IcsEvent]:
+    log("INFO", "fetching_ics", url=runna_ics_url)
+    # Parse as the body streams in instead of buffering the whole feed
+    with FEED_SESSION.get(runna_ics_url, stream=True, timeout=60) as ics_resp:
+        ics_resp.raise_for_status()
+        if ics_resp.encoding is None:
+            ics_resp.encoding = "utf-8"
+        return list(parse_ics_events_stream(ics_resp.iter_lines(decode_unicode=True)))
+
+
+def slim_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Bulk call result without the raw response body (kept only in DEBUG)
+    return {k: v for k, v in result.items() if k != "json"}
+
+
 def run_sync(
     *,
     api_key: str,
@@ -818,6 +1050,7 @@ def run_sync(
     log_level: str,
 ) -> Dict[str, Any]:
     lvl = normalize_log_level(log_level)
+    debug = is_debug(lvl)
 
     log(
         "INFO",
@@ -831,70 +1064,86 @@ def run_sync(
         log_level=lvl,
     )
 
-    auth_test(api_key, athlete_id, lvl)
+    # The feed is on another host: download and parse it while the Intervals
+    # auth / folder round trips are in flight.
+    get_events = prefetch(fetch_ics_events, runna_ics_url)
 
-    folder_name = folder_name or DEFAULT_FOLDER_NAME
-    folder_id = ensure_folder(api_key, athlete_id, folder_name, lvl)
+    folders = auth_test(api_key, athlete_id, lvl)
 
-    log("INFO", "fetching_ics", url=runna_ics_url)
-    ics_resp = requests.get(runna_ics_url, timeout=60)
-    ics_resp.raise_for_status()
+    folder_name = folder_name or DEFAULT_FOLDER_NAME
+    folder_id = ensure_folder(api_key, athlete_id, folder_name, lvl, folders=folders)
 
-    events = parse_ics_events(ics_resp.text)
+    events = sort_events(get_events())
     log("INFO", "ics_parsed", events=len(events))
 
-    selected = select_events(events, include_today, all_workouts, next_week, lvl)
-    selected = hard_guard_drop_past(selected, include_today, lvl)
-
-    built: List[Tuple[IcsEvent, bool, Dict[str, Any]]] = []
+    # One "today" for the whole run, so both filters agree across midnight
+    today = aus_today()
+    selected = select_events(events, include_today, all_workouts, next_week, today=today)
+    selected = hard_guard_drop_past(selected, include_today, debug, today=today)
+
+    # Nothing to translate, upload or delete: skip the build and the empty bulk call
+    if not selected:
+        log("INFO", "nothing_to_sync")
+        skipped = {"skipped": True, "reason": "no events"}
+        res: Dict[str, Any] = {"identified": 0, "validation_report": {"total": 0, "ok": 0, "partial": 0}}
+        if delete_all:
+            res["delete_result"] = skipped
+        res["upload_result"] = skipped
+        res["dry_run"] = dry_run
+        return res
+
+    # Parallel to selected: the upload body is payloads itself, no per-event tuples
+    build = build_intervals_event
+    base = payload_base(folder_id)
+    payloads: List[Dict[str, Any]] = []
+    partials: List[bool] = []
+    add_payload, add_partial = payloads.append, partials.append
     for ev in selected:
-        payload, partial = build_intervals_event(ev, folder_id, lvl)
-        built.append((ev, partial, payload))
+        payload, partial = build(ev, base)
+        add_payload(payload)
+        add_partial(partial)
 
-    report = make_validation_report(built, lvl)
+    report = make_validation_report(selected, partials, payloads, debug)
     log("INFO", "validation_report", total=report["total"], ok=report["ok"], partial=report["partial"])
-    if is_debug(lvl) and "partial_examples" in report:
+    if debug and "partial_examples" in report:
         log("DEBUG", "validation_partial_examples", examples=report["partial_examples"])
 
     if clean_legacy:
         log("INFO", "clean_legacy_noop", note="Flag is present; legacy cleanup is not implemented in this sync script.")
 
     if delete_all:
-        refs = [{"external_id": ev.uid} for (ev, _partial, _payload) in built]
+        refs = [{"external_id": ev.uid} for ev in selected]
         log("INFO", "delete_all_start", count=len(refs))
         delete_result = bulk_delete_events(api_key, athlete_id, refs, lvl, dry_run)
 
-        if is_debug(lvl):
+        if debug:
             log("DEBUG", "delete_all_complete", result=delete_result)
         else:
-            slim = dict(delete_result)
-            slim.pop("json", None)
-            log("INFO", "delete_all_complete", **slim)
+            delete_result = slim_result(delete_result)
+            log("INFO", "delete_all_complete", **delete_result)
 
         log("INFO", "upload_skipped", reason="--delete-all set")
         return {
-            "identified": len(built),
+            "identified": len(selected),
             "validation_report": report,
-            "delete_result": (delete_result if is_debug(lvl) else {k: v for k, v in dict(delete_result).items() if k != "json"}),
+            "delete_result": delete_result,
             "upload_result": {"skipped": True, "reason": "--delete-all set"},
             "dry_run": dry_run,
         }
 
-    upload_payload = [payload for (_ev, _partial, payload) in built]
-    upload_result = bulk_upload_events(api_key, upload_payload, lvl, dry_run)
+    upload_result = bulk_upload_events(api_key, payloads, lvl, dry_run)
 
     # Upload-complete: full response JSON only in DEBUG
-    if is_debug(lvl):
+    if debug:
         log("DEBUG", "upload_complete", result=upload_result)
     else:
-        slim = dict(upload_result)
-        slim.pop("json", None)
-        log("INFO", "upload_complete", **slim)
+        upload_result = slim_result(upload_result)
+        log("INFO", "upload_complete", **upload_result)
 
     return {
-        "identified": len(built),
+        "identified": len(selected),
         "validation_report": report,
-        "upload_result": (upload_result if is_debug(lvl) else {k: v for k, v in dict(upload_result).items() if k != "json"}),
+        "upload_result": upload_result,
         "dry_run": dry_run,
     }
 
@@ -1026,17 +1275,7 @@ class Default(WorkerEntrypoint):  # type: ignore
             return Response("Missing env vars", status=500)  # type: ignore
 
         q = parse_qs(urlparse(request.url).query)
-
-        def qbool(name: str) -> bool:
-            v = (q.get(name, ["false"])[0] or "").lower()
-            return v in ("1", "true", "yes", "y", "on")
-
-        dry_run = qbool("dry_run")
-        include_today = qbool("include_today")
-        all_workouts = qbool("all_workouts")
-        next_week = qbool("next_week")
-        delete_all = qbool("delete_all")
-        clean_legacy = qbool("clean_legacy")
+        flags = {name: (q.get(name, ("false",))[0] or "").lower() in TRUTHY for name in RUN_FLAGS}
 
         log_level = normalize_log_level(q.get("log_level", ["INFO"])[0])
         folder_name = (q.get("folder_name", [DEFAULT_FOLDER_NAME])[0] or DEFAULT_FOLDER_NAME)
@@ -1046,16 +1285,11 @@ class Default(WorkerEntrypoint):  # type: ignore
             athlete_id=athlete_id,
             runna_ics_url=runna_ics_url,
             folder_name=folder_name,
-            dry_run=dry_run,
-            include_today=include_today,
-            all_workouts=all_workouts,
-            next_week=next_week,
-            delete_all=delete_all,
-            clean_legacy=clean_legacy,
             log_level=log_level,
+            **flags,
         )
 
-        return Response(json.dumps(res), headers={"Content-Type": "application/json"})  # type: ignore
+        return Response(JSON_ENCODE(res), headers={"Content-Type": "application/json; charset=utf-8"})  # type: ignore
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+import runna_sync
+from runna_sync import bulk_request
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        if isinstance(self._body, Exception):
+            raise self._body
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def request(self, method, url, json=None, **kwargs):
+        self.sent.append(json)
+        return self.responses.pop(0)
+
+
+def run(monkeypatch, items, responses, batch_size=2):
+    session = FakeSession(responses)
+    monkeypatch.setattr(runna_sync, "SESSION", session)
+    monkeypatch.setattr(runna_sync, "BATCH_SIZE", batch_size)
+    return bulk_request("INFO", "POST", "https://example.test/bulk", "key", items), session.sent
+
+
+def test_single_batch_reports_as_one_request(monkeypatch):
+    out, sent = run(monkeypatch, [{"id": 1}, {"id": 2}], [FakeResponse(200, {"ok": True})])
+    assert sent == [[{"id": 1}, {"id": 2}]]
+    assert out == {"dry_run": False, "count": 2, "status": 200, "json": {"ok": True}}
+
+
+def test_empty_items_still_send_one_request(monkeypatch):
+    out, sent = run(monkeypatch, [], [FakeResponse(200, [])])
+    assert sent == [[]]
+    assert out == {"dry_run": False, "count": 0, "status": 200, "json": []}
+
+
+def test_list_bodies_are_concatenated_across_batches(monkeypatch):
+    items = [{"id": i} for i in range(5)]
+    responses = [FakeResponse(200, [1, 2]), FakeResponse(201, [3, 4]), FakeResponse(200, [5])]
+    out, sent = run(monkeypatch, items, responses)
+    assert sent == [items[0:2], items[2:4], items[4:5]]
+    assert out == {"dry_run": False, "count": 5, "status": 201, "batches": 3, "json": [1, 2, 3, 4, 5]}
+
+
+def test_non_list_bodies_are_kept_per_batch(monkeypatch):
+    items = [{"id": i} for i in range(3)]
+    responses = [FakeResponse(204, ValueError("no body")), FakeResponse(200, {"deleted": 1})]
+    out, _ = run(monkeypatch, items, responses)
+    assert out == {"dry_run": False, "count": 3, "status": 204, "batches": 2, "json": [None, {"deleted": 1}]}
@@ -1,5 +1,5 @@
 import pathlib
-from runna_sync import parse_ics_events
+from runna_sync import parse_ics_events, parse_ics_events_stream
 
 FIXTURES = pathlib.Path(__file__).parent / "fixtures"
 
@@ -16,4 +16,9 @@ def test_parse_single_event():
 def test_parse_multiple_fixtures():
     events = parse_ics_events(load("rolling_400s_with_separators.ics"))
     assert len(events) == 1
-    assert events[0].summary == "Rolling 400s"
\ No newline at end of file
+    assert events[0].summary == "Rolling 400s"
+
+def test_stream_parse_matches_text_parse():
+    for name in ("simple_single_event.ics", "rolling_400s_with_separators.ics", "hills_repeat_no_separators.ics"):
+        text = load(name)
+        assert list(parse_ics_events_stream(text.splitlines())) == parse_ics_events(text)
@@ -0,0 +1,56 @@
+import datetime as dt
+import random
+
+from runna_sync import IcsEvent, hard_guard_drop_past, select_events, sort_events
+
+TODAY = dt.date(2026, 1, 10)
+
+
+def reference_select(events, include_today, all_workouts, next_week):
+    # The original list-comprehension filters
+    if all_workouts:
+        selected = events[:]
+    elif include_today:
+        selected = [e for e in events if e.dtstart_date >= TODAY]
+    else:
+        selected = [e for e in events if e.dtstart_date > TODAY]
+
+    if next_week:
+        start = TODAY if include_today else TODAY + dt.timedelta(days=1)
+        end = start + dt.timedelta(days=7)
+        selected = [e for e in selected if start <= e.dtstart_date < end]
+    return selected
+
+
+def reference_hard_guard(selected, include_today):
+    if include_today:
+        return [e for e in selected if e.dtstart_date >= TODAY]
+    return [e for e in selected if e.dtstart_date > TODAY]
+
+
+def make_events(rnd, n):
+    dates = [TODAY + dt.timedelta(days=rnd.randint(-10, 12)) for _ in range(n)]
+    return [IcsEvent(uid=f"ev-{i}", summary="s", description="d", dtstart_date=d) for i, d in enumerate(dates)]
+
+
+def test_selection_matches_list_comprehension_filters():
+    rnd = random.Random(0)
+    for n in (0, 1, 2, 5, 30):
+        for _ in range(20):
+            events = sort_events(make_events(rnd, n))
+            for include_today in (False, True):
+                for all_workouts in (False, True):
+                    for next_week in (False, True):
+                        expected = reference_select(events, include_today, all_workouts, next_week)
+                        selected = select_events(events, include_today, all_workouts, next_week, today=TODAY)
+                        assert selected == expected
+
+                        kept = hard_guard_drop_past(selected, include_today, False, today=TODAY)
+                        assert kept == reference_hard_guard(expected, include_today)
+
+
+def test_sort_events_is_stable_by_date():
+    events = make_events(random.Random(1), 40)
+    expected = sorted(events, key=lambda e: e.dtstart_date)
+    assert sort_events(events) is events
+    assert [e.uid for e in events] == [e.uid for e in expected]
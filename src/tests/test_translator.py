@@ -1,6 +1,6 @@
 import unittest
 
-from runna_sync import translate_workout_to_intervals_text
+from runna_sync import clean_line, translate_workout_to_intervals_text
 
 
 class TranslatorTests(unittest.TestCase):
@@ -47,6 +47,17 @@ class TranslatorTests(unittest.TestCase):
         out, _ = translate_workout_to_intervals_text(name, desc)
         self.assertIn("HR", out)
 
+    def test_clean_line_easy_phrase_before_disclaimer(self):
+        self.assertEqual(clean_line("Run at whatever pace feels truly easy! This is a limit, not a target."), "")
+        self.assertEqual(clean_line("• 2km Run at whatever pace feels truly easy! Not a target"), "2km")
+
+    def test_clean_line_disclaimer_before_easy_phrase(self):
+        self.assertEqual(
+            clean_line("12km easy run. This is a limit, not a target - run at whatever pace feels truly easy!"),
+            "12km easy run",
+        )
+        self.assertEqual(clean_line("2km not a target - run at whatever pace feels truly easy!"), "2km")
+
 
 if __name__ == "__main__":
-    unittest.main(verbosity=2)
\ No newline at end of file
+    unittest.main(verbosity=2)